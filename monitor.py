@@ -1,4 +1,5 @@
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from scanner import SPYScanner
 from tabulate import tabulate
@@ -7,6 +8,39 @@ from tabulate import tabulate
 SCAN_INTERVAL_SECONDS = 60
 DISCOUNT_THRESHOLD = 15.0
 TICKERS = ["SPY", "QQQ", "SOXX", "NVDA", "AAPL"]
+MAX_WORKERS = min(8, len(TICKERS))
+
+# One scanner per ticker, built once and reused every cycle: keeps the
+# yf.Ticker handle (and yfinance's built-in request caching) warm
+# instead of recreating it per scan.
+SCANNERS = {ticker: SPYScanner(ticker) for ticker in TICKERS}
+
+def _scan_one(ticker):
+    """Scan one ticker for LEAPS bargains. Returns a DataFrame or None."""
+    scanner = SCANNERS[ticker]
+
+    # Scan LEAPS
+    options_df = scanner.scan_options(min_volume=0, money_range_pct=0.50, min_days_to_expiry=365)
+
+    if options_df.empty:
+        return None
+
+    # Filter ITM Calls
+    current_price = scanner.current_price
+    itm_calls = options_df[ (options_df['type'] == 'call') & (options_df['strike'] < current_price) ]
+
+    if itm_calls.empty:
+        return None
+
+    # Use internal helper to get bargains, but we want ALL of them to aggregate first
+    # logic from scanner.find_bargains allows getting top_n. Let's get top 20 per ticker to save memory
+    _, bargains = scanner.find_bargains(itm_calls, top_n=20)
+
+    if bargains.empty:
+        return None
+
+    bargains['Ticker'] = ticker # Add Identifier
+    return bargains
 
 def main():
     print("Initializing Market Options Monitor (Console Mode)...")
@@ -20,31 +54,19 @@ def main():
             print(f"\n[{timestamp}] Scanning LEAPS across {len(TICKERS)} tickers...")
             
             all_bargains = []
-            
-            for ticker in TICKERS:
-                try:
-                    # print(f"  > Scanning {ticker}...", end="\r")
-                    scanner = SPYScanner(ticker)
-                    
-                    # Scan LEAPS
-                    options_df = scanner.scan_options(min_volume=0, money_range_pct=0.50, min_days_to_expiry=365)
-                    
-                    if not options_df.empty:
-                        # Filter ITM Calls
-                        current_price = scanner.current_price
-                        itm_calls = options_df[ (options_df['type'] == 'call') & (options_df['strike'] < current_price) ]
-                        
-                        if not itm_calls.empty:
-                            # Use internal helper to get bargains, but we want ALL of them to aggregate first
-                            # logic from scanner.find_bargains allows getting top_n. Let's get top 20 per ticker to save memory
-                            _, bargains = scanner.find_bargains(itm_calls, top_n=20)
-                            
-                            if not bargains.empty:
-                                bargains['Ticker'] = ticker # Add Identifier
-                                all_bargains.append(bargains)
-                                
-                except Exception as e:
-                    print(f"  x Error scanning {ticker}: {e}")
+
+            # Each ticker scan is network-bound (yfinance), so run them in
+            # parallel threads instead of serially.
+            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+                futures = {executor.submit(_scan_one, ticker): ticker for ticker in TICKERS}
+                for future in as_completed(futures):
+                    ticker = futures[future]
+                    try:
+                        bargains = future.result()
+                        if bargains is not None:
+                            all_bargains.append(bargains)
+                    except Exception as e:
+                        print(f"  x Error scanning {ticker}: {e}")
 
             # Process Aggregated Results
             if all_bargains:
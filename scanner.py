@@ -1,19 +1,30 @@
+import time
 import yfinance as yf
 import pandas as pd
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from utils import calculate_time_to_expiry, black_scholes_call, black_scholes_put, calculate_delta, calculate_implied_volatility
+from utils import PRICING_DTYPE, PricingBatch, calculate_time_to_expiry, price_and_greeks
 
 RISK_FREE_RATE = 0.045  # Approx 4.5%
+PRICE_TTL_SECONDS = 30  # How long a fetched spot price stays fresh
+EXPIRATIONS_TTL_SECONDS = 24 * 3600  # New expiries get listed at most daily
 
 class SPYScanner:
     def __init__(self, ticker="SPY"):
         self.ticker_symbol = ticker
         self.stock = yf.Ticker(ticker)
         self.current_price = None
+        self._price_fetched_at = None
+        self._expirations = None
+        self._expirations_fetched_at = None
 
     def fetch_current_price(self):
-        """Fetch the latest underlying price."""
+        """Fetch the latest underlying price (cached for PRICE_TTL_SECONDS)."""
+        if self.current_price is not None and self._price_fetched_at is not None:
+            if time.monotonic() - self._price_fetched_at < PRICE_TTL_SECONDS:
+                return self.current_price
+
         # fast_info is usually faster and more reliable than history() for latest price
         try:
             self.current_price = self.stock.fast_info['last_price']
@@ -22,10 +33,21 @@ class SPYScanner:
             hist = self.stock.history(period="1d")
             if not hist.empty:
                 self.current_price = hist['Close'].iloc[-1]
+        if self.current_price is not None:
+            self._price_fetched_at = time.monotonic()
         return self.current_price
 
     def get_expirations(self):
-        return self.stock.options
+        # stock.options is a property that can hit the network on every
+        # access. The list rarely changes intraday but scanners now live
+        # for the whole monitor process, so refresh it once a day rather
+        # than caching forever (new LEAPS listings would never be seen).
+        now = time.monotonic()
+        if (self._expirations is None
+                or now - self._expirations_fetched_at >= EXPIRATIONS_TTL_SECONDS):
+            self._expirations = tuple(self.stock.options)
+            self._expirations_fetched_at = now
+        return self._expirations
 
     def scan_options(self, expirations_to_scan=3, min_volume=100, money_range_pct=0.05, expiry_filter=None, min_days_to_expiry=None):
         """
@@ -38,8 +60,9 @@ class SPYScanner:
             expiry_filter (str): Optional string to filter expirations (e.g., "2028-01").
             min_days_to_expiry (int): Optional, only scan expirations > X days away.
         """
-        if self.current_price is None:
-            self.fetch_current_price()
+        # TTL-cached: a no-op if the price was fetched in the last 30s,
+        # a refresh otherwise (important when a scanner is reused).
+        self.fetch_current_price()
 
         all_options = []
         available_expirations = self.get_expirations()
@@ -50,11 +73,12 @@ class SPYScanner:
         if expiry_filter:
             target_expirations = [e for e in available_expirations if expiry_filter in e]
         elif min_days_to_expiry:
-            # Filter dynamically by days
-            for exp in available_expirations:
-                days = calculate_time_to_expiry(exp) * 365
-                if days >= min_days_to_expiry:
-                    target_expirations.append(exp)
+            # Filter dynamically by days: one vectorized to_datetime pass
+            # instead of a strptime call per expiry
+            exp_dates = pd.to_datetime(list(available_expirations))
+            days = (exp_dates - pd.Timestamp.now()).days
+            keep = np.asarray(days) >= min_days_to_expiry
+            target_expirations = [e for e, k in zip(available_expirations, keep) if k]
         else:
             # Limit to the requested number of expirations
             target_expirations = available_expirations[:expirations_to_scan]
@@ -66,119 +90,18 @@ class SPYScanner:
         print(f"Scanning expirations: {target_expirations}")
         print(f"Current {self.ticker_symbol} Price: ${self.current_price:.2f}")
 
-        for exp in target_expirations:
+        # Fetch phase: each option_chain call is a network round-trip, so
+        # pull all expirations in parallel. Processing stays sequential
+        # below (CPU-bound, and pandas is not thread-safe).
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            fetched = list(executor.map(self._fetch_chain, target_expirations))
+
+        for exp, opt_chain, T in fetched:
+            if opt_chain is None:
+                continue
             try:
-                opt_chain = self.stock.option_chain(exp)
-                T = calculate_time_to_expiry(exp)
-                
-                # Process Calls
-                calls = opt_chain.calls
-                calls['type'] = 'call'
-                calls['T'] = T
-                calls['expiry'] = exp
-                
-                # Process Puts
-                puts = opt_chain.puts
-                puts['type'] = 'put'
-                puts['T'] = T
-                puts['expiry'] = exp
-                
-                # Combine
-                chain = pd.concat([calls, puts])
-                
-                # Filter by Volume
-                chain = chain[chain['volume'] >= min_volume]
-                
-                # Filter by Strike (Money Range)
-                lower_bound = self.current_price * (1 - money_range_pct)
-                upper_bound = self.current_price * (1 + money_range_pct)
-                chain = chain[(chain['strike'] >= lower_bound) & (chain['strike'] <= upper_bound)]
-                
-                # --- Cheapness Logic ---
-                
-                # 1. Calculate Robust ATM Volatility
-                # yfinance often returns 0 or NaN for IV on illiquid LEAPS.
-                # We typically want the "Average IV" of strikes near the money.
-                
-                # Filter for "Near-the-Money" options (within 5%) that have VALID IV (> 1%)
-                valid_iv_options = chain[
-                    (chain['strike'] >= self.current_price * 0.95) & 
-                    (chain['strike'] <= self.current_price * 1.05) & 
-                    (chain['impliedVolatility'] > 0.01)
-                ]
-                
-                if not valid_iv_options.empty:
-                    atm_iv = valid_iv_options['impliedVolatility'].mean()
-                else:
-                    # Fallback: Look wider (10%)
-                    valid_iv_options_wide = chain[
-                        (chain['strike'] >= self.current_price * 0.90) & 
-                        (chain['strike'] <= self.current_price * 1.10) & 
-                        (chain['impliedVolatility'] > 0.01)
-                    ]
-                    if not valid_iv_options_wide.empty:
-                        atm_iv = valid_iv_options_wide['impliedVolatility'].mean()
-                    else:
-                         # Last resort fallback (e.g., historical avg for SPY ~15-20%)
-                         # This prevents the "Delta 1.0" issue when data is missing.
-                        atm_iv = 0.15 
-                
-                chain['atm_iv_ref'] = atm_iv
-                
-                bs_prices = []
-                deltas = []
-                recalc_ivs = []
-                
-                for index, row in chain.iterrows():
-                    # Use ASK Price just for valuation if available (Buyer's perspective)
-                    ask_price = row.get('ask', 0)
-                    bid_price = row.get('bid', 0)
-                    last_price = row['lastPrice']
-                    
-                    # PRIORITY: Ask > Last
-                    if ask_price > 0:
-                        market_price = ask_price
-                    else:
-                        market_price = last_price
-                    
-                    # Save for display
-                    chain.at[index, 'priceUsed'] = market_price
-                    
-                    strike = row['strike']
-                    otype = row['type']
-                    
-                    # A. Back-solve Implied Volatility from Market Price
-                    calc_iv = calculate_implied_volatility(market_price, self.current_price, strike, T, RISK_FREE_RATE, otype)
-                    
-                    # Sanity check
-                    if calc_iv <= 0.001 or calc_iv >= 4.9:
-                         iv_to_use = atm_iv
-                    else:
-                         iv_to_use = calc_iv
-                         
-                    recalc_ivs.append(iv_to_use)
-                    
-                    # B. Calculate Greeks with THIS IV
-                    delta = calculate_delta(self.current_price, strike, T, RISK_FREE_RATE, iv_to_use, otype)
-                    deltas.append(delta)
-
-                    # C. Calculate "Theoretical" Price using ATM Volatility
-                    if otype == 'call':
-                        theo = black_scholes_call(self.current_price, strike, T, RISK_FREE_RATE, atm_iv)
-                    else:
-                        theo = black_scholes_put(self.current_price, strike, T, RISK_FREE_RATE, atm_iv)
-                    bs_prices.append(theo)
-                
-                # Update DataFrame with our calculated values
-                chain['impliedVolatility'] = recalc_ivs
-                chain['theo_price_at_atm_iv'] = bs_prices
-                chain['delta'] = deltas
-                
-                # Discount: (Theo - PriceUsed) / PriceUsed * 100
-                chain['discount_pct'] = (chain['theo_price_at_atm_iv'] - chain['priceUsed']) / chain['priceUsed'] * 100
-                
+                chain = self._process_chain(exp, opt_chain, T, min_volume, money_range_pct)
                 all_options.append(chain)
-                
             except Exception as e:
                 print(f"Error processing expiry {exp}: {e}")
 
@@ -188,6 +111,116 @@ class SPYScanner:
         full_df = pd.concat(all_options)
         return full_df
 
+    def _fetch_chain(self, exp):
+        """Fetch one expiry's option chain. Returns (exp, opt_chain, T); opt_chain is None on error."""
+        try:
+            opt_chain = self.stock.option_chain(exp)
+            T = calculate_time_to_expiry(exp)
+            return exp, opt_chain, T
+        except Exception as e:
+            print(f"Error fetching expiry {exp}: {e}")
+            return exp, None, None
+
+    def _process_chain(self, exp, opt_chain, T, min_volume, money_range_pct):
+        """Filter one expiry's chain and compute IV, delta and theoretical price."""
+        # Process Calls
+        calls = opt_chain.calls
+        calls['type'] = 'call'
+        calls['T'] = T
+        calls['expiry'] = exp
+        
+        # Process Puts
+        puts = opt_chain.puts
+        puts['type'] = 'put'
+        puts['T'] = T
+        puts['expiry'] = exp
+        
+        # Combine. Moving the chain onto PyArrow-backed dtypes makes the
+        # boolean filters and concat below columnar/zero-copy; the NumPy
+        # kernels are unaffected since they extract plain arrays anyway.
+        # (A full Polars port would mean a pandas round-trip per expiry,
+        # which costs more than it saves at chain sizes yfinance returns.)
+        chain = pd.concat([calls, puts]).convert_dtypes(dtype_backend='pyarrow')
+
+        # Filter by Volume and Strike (Money Range) with a single combined
+        # mask so we only pay for one filtered copy of the chain
+        lower_bound = self.current_price * (1 - money_range_pct)
+        upper_bound = self.current_price * (1 + money_range_pct)
+        strike = chain['strike'].to_numpy(dtype=np.float64)
+        volume = chain['volume'].to_numpy(dtype=np.float64)
+        keep = (volume >= min_volume) & (strike >= lower_bound) & (strike <= upper_bound)
+        chain = chain.loc[keep].reset_index(drop=True)
+
+        # --- Cheapness Logic ---
+
+        # 1. Calculate Robust ATM Volatility
+        # yfinance often returns 0 or NaN for IV on illiquid LEAPS.
+        # We typically want the "Average IV" of strikes near the money.
+        # Boolean masks over the already-extracted arrays, no intermediate
+        # DataFrames.
+        strike = strike[keep]
+        market_iv = chain['impliedVolatility'].to_numpy(dtype=np.float64)
+        valid_iv = market_iv > 0.01
+
+        # "Near-the-Money" options (within 5%) that have VALID IV (> 1%)
+        near_atm = valid_iv & (strike >= self.current_price * 0.95) & (strike <= self.current_price * 1.05)
+
+        if near_atm.any():
+            atm_iv = market_iv[near_atm].mean()
+        else:
+            # Fallback: Look wider (10%)
+            wide_atm = valid_iv & (strike >= self.current_price * 0.90) & (strike <= self.current_price * 1.10)
+            if wide_atm.any():
+                atm_iv = market_iv[wide_atm].mean()
+            elif valid_iv.any():
+                # Next best: IV of the valid strike closest to spot.
+                # argmin is O(N), no need to sort the abs-diffs.
+                candidates = np.flatnonzero(valid_iv)
+                nearest = candidates[np.abs(strike[candidates] - self.current_price).argmin()]
+                atm_iv = market_iv[nearest]
+            else:
+                 # Last resort fallback (e.g., historical avg for SPY ~15-20%)
+                 # This prevents the "Delta 1.0" issue when data is missing.
+                atm_iv = 0.15
+
+        # Use ASK Price just for valuation if available (Buyer's perspective).
+        # PRIORITY: Ask > Last. Column-wise instead of iterrows/at, which
+        # materialize Python rows and run per-cell dtype checks.
+        if 'ask' in chain.columns:
+            ask = chain['ask'].fillna(0).to_numpy(dtype=np.float64)
+        else:
+            ask = np.zeros(len(chain))
+        last = chain['lastPrice'].to_numpy(dtype=np.float64)
+        prices = np.where(ask > 0, ask, last)
+
+        # SoA bundle for the pricing kernel: contiguous 1-D arrays instead
+        # of DataFrame rows. Scalars (S, T, r) stay Python floats. The bulk
+        # arrays run in single precision (see utils.PRICING_DTYPE);
+        # priceUsed/discount_pct stay float64 for display.
+        batch = PricingBatch(
+            price=prices.astype(PRICING_DTYPE, copy=False),
+            K=chain['strike'].to_numpy(dtype=PRICING_DTYPE),
+            is_call=(chain['type'] == 'call').to_numpy(),
+        )
+        theo, delta, iv = price_and_greeks(batch, self.current_price, T, RISK_FREE_RATE, atm_iv)
+
+        # Attach every computed column in a single axis-1 concat instead of
+        # one insert per column, each of which can trigger block
+        # consolidation on the freshly concatenated frame. (Copy-on-Write
+        # in pandas makes the concat itself lazy.)
+        extra = pd.DataFrame({
+            'atm_iv_ref': atm_iv,
+            'priceUsed': prices,
+            'impliedVolatility': iv,
+            'theo_price_at_atm_iv': theo,
+            'delta': delta,
+            # Discount: (Theo - PriceUsed) / PriceUsed * 100
+            'discount_pct': (theo - prices) / prices * 100,
+        }, index=chain.index)
+        chain = pd.concat([chain.drop(columns=['impliedVolatility']), extra], axis=1)
+
+        return chain
+
     def find_bargains(self, df, top_n=10):
         """
         Filter and sort for the best bargains.
@@ -198,11 +231,12 @@ class SPYScanner:
         if df.empty:
             return df
         
-        # Sort by lowest IV
-        lowest_iv = df.sort_values(by='impliedVolatility').head(top_n)
-        
-        # Sort by biggest discount % (Market Price is lower than Theoretical ATM price)
+        # Lowest IV first. nsmallest/nlargest keep a top_n heap instead of
+        # fully sorting the frame.
+        lowest_iv = df.nsmallest(top_n, 'impliedVolatility')
+
+        # Biggest discount % (Market Price is lower than Theoretical ATM price)
         # We filter where discount is positive (Market < Model)
-        discounted = df[df['discount_pct'] > 0].sort_values(by='discount_pct', ascending=False).head(top_n)
-        
+        discounted = df[df['discount_pct'] > 0].nlargest(top_n, 'discount_pct')
+
         return lowest_iv, discounted
@@ -0,0 +1,62 @@
+"""Tests for the batched IV solvers against the scalar reference path."""
+import numpy as np
+
+from utils import (
+    black_scholes_call,
+    black_scholes_put,
+    calculate_implied_volatility,
+    implied_volatility_batch,
+)
+from utils_numba import iv_batch
+
+S = 500.0
+T = 1.2
+R = 0.045
+
+
+def make_chain(n=40, seed=1):
+    """Synthetic chain: strikes, true IVs and the Black-Scholes prices they imply."""
+    rng = np.random.default_rng(seed)
+    K = np.linspace(0.7 * S, 1.3 * S, n)
+    iv_true = rng.uniform(0.10, 0.60, n)
+    is_call = np.arange(n) % 2 == 0
+    prices = np.array([
+        black_scholes_call(S, k, T, R, sigma) if call else black_scholes_put(S, k, T, R, sigma)
+        for k, sigma, call in zip(K, iv_true, is_call)
+    ], dtype=np.float64)
+    return K, iv_true, is_call, prices
+
+
+def test_iv_batch_matches_scalar_solver():
+    K, iv_true, is_call, prices = make_chain()
+    got = iv_batch(prices, S, K, T, R, is_call)
+    scalar = np.array([
+        calculate_implied_volatility(p, S, k, T, R, 'call' if call else 'put')
+        for p, k, call in zip(prices, K, is_call)
+    ])
+    assert np.max(np.abs(got - iv_true)) < 1e-3
+    assert np.max(np.abs(got - scalar)) < 1e-3
+
+
+def test_implied_volatility_batch_matches_scalar_solver():
+    K, iv_true, is_call, prices = make_chain(seed=2)
+    got = implied_volatility_batch(prices, S, K, T, R, is_call)
+    scalar = np.array([
+        calculate_implied_volatility(p, S, k, T, R, 'call' if call else 'put')
+        for p, k, call in zip(prices, K, is_call)
+    ])
+    assert np.max(np.abs(got - iv_true)) < 1e-3
+    assert np.max(np.abs(got - scalar)) < 1e-3
+
+
+def test_batch_solvers_agree_on_bad_prices():
+    # NaN / zero / negative quotes must yield 0 (-> ATM fallback in the
+    # scanner) on both paths, not the Newton initial guess.
+    prices = np.array([np.nan, 0.0, -1.0, 10.0])
+    K = np.full(4, S)
+    is_call = np.full(4, True)
+    nb = iv_batch(prices, S, K, T, R, is_call)
+    npy = implied_volatility_batch(prices, S, K, T, R, is_call)
+    assert list(nb[:3]) == [0.0, 0.0, 0.0]
+    assert list(npy[:3]) == [0.0, 0.0, 0.0]
+    assert np.allclose(nb, npy, atol=1e-6)
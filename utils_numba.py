@@ -0,0 +1,107 @@
+import math
+import numpy as np
+from numba import njit, prange, vectorize
+
+# fastmath minus the 'nnan' flag: yfinance quotes contain NaN prices, and
+# full fastmath lets LLVM fold NaN comparisons away, which would defeat
+# the bad-price guard in iv_batch.
+FASTMATH_FLAGS = {'ninf', 'nsz', 'arcp', 'contract', 'afn', 'reassoc'}
+
+
+@njit(fastmath=True, cache=True)
+def _norm_cdf(x):
+    """Standard normal CDF via math.erf (scipy is not available inside numba)."""
+    return 0.5 * (1.0 + math.erf(x / math.sqrt(2.0)))
+
+
+@njit(fastmath=True, cache=True)
+def _norm_pdf(x):
+    """Standard normal PDF."""
+    return math.exp(-0.5 * x * x) / math.sqrt(2.0 * math.pi)
+
+
+@vectorize(['float64(float64, float64, float64, float64, float64)'], fastmath=True, cache=True)
+def black_scholes_call(S, K, T, r, sigma):
+    """Compiled Black-Scholes call price; accepts scalars or arrays."""
+    if T <= 0:
+        return max(0.0, S - K)
+    if sigma <= 0:
+        d_1 = 0.0
+        d_2 = 0.0
+    else:
+        sqrt_T = math.sqrt(T)
+        d_1 = (math.log(S / K) + (r + 0.5 * sigma * sigma) * T) / (sigma * sqrt_T)
+        d_2 = d_1 - sigma * sqrt_T
+    return S * _norm_cdf(d_1) - K * math.exp(-r * T) * _norm_cdf(d_2)
+
+
+@vectorize(['float64(float64, float64, float64, float64, float64)'], fastmath=True, cache=True)
+def black_scholes_put(S, K, T, r, sigma):
+    """Compiled Black-Scholes put price; accepts scalars or arrays."""
+    if T <= 0:
+        return max(0.0, K - S)
+    if sigma <= 0:
+        d_1 = 0.0
+        d_2 = 0.0
+    else:
+        sqrt_T = math.sqrt(T)
+        d_1 = (math.log(S / K) + (r + 0.5 * sigma * sigma) * T) / (sigma * sqrt_T)
+        d_2 = d_1 - sigma * sqrt_T
+    return K * math.exp(-r * T) * _norm_cdf(-d_2) - S * _norm_cdf(-d_1)
+
+
+@njit(parallel=True, fastmath=FASTMATH_FLAGS, cache=True)
+def iv_batch(prices, S, K, T, r, is_call, tol=1e-5, max_iter=100):
+    """
+    Newton-Raphson implied volatility for a whole batch of options.
+
+    prices, K, is_call are 1-D arrays; S, T, r are scalars shared by the
+    batch (one expiry). Returns an array of IVs; 0 where no solution.
+    Mirrors utils.calculate_implied_volatility, but JIT-compiled and
+    parallelized across options.
+    """
+    n = len(K)
+    out = np.empty(n, dtype=np.float64)
+    for i in prange(n):
+        price = prices[i]
+        k = K[i]
+        # not (price > 0) also catches NaN quotes (NaN <= 0 is False),
+        # which would otherwise fall through and return the 0.5 guess
+        if T <= 0 or not (price > 0):
+            out[i] = 0.0
+            continue
+
+        sqrt_T = math.sqrt(T)
+        disc = math.exp(-r * T)
+        sigma = 0.5  # Initial guess (50%)
+
+        for _ in range(max_iter):
+            d_1 = (math.log(S / k) + (r + sigma * sigma / 2.0) * T) / (sigma * sqrt_T)
+            d_2 = d_1 - sigma * sqrt_T
+
+            if is_call[i]:
+                theo_price = S * _norm_cdf(d_1) - k * disc * _norm_cdf(d_2)
+            else:
+                theo_price = k * disc * _norm_cdf(-d_2) - S * _norm_cdf(-d_1)
+
+            diff = theo_price - price
+
+            if abs(diff) < tol:
+                break
+
+            vega = S * sqrt_T * _norm_pdf(d_1)
+
+            if vega == 0:
+                break
+
+            sigma = sigma - diff / vega
+
+            # Keep sigma within bounds
+            if sigma <= 0:
+                sigma = 0.001
+            if sigma > 5.0:  # Cap at 500%
+                sigma = 5.0
+                break
+
+        out[i] = sigma
+    return out